@@ -13,9 +13,13 @@
 # that they have been altered from the originals.
 
 from abc import ABC
+from collections import Counter
 import requests
+import uuid
 from typing import Union, List
 
+import numpy as np
+
 from qiskit.providers import BackendV1 as Backend
 from qiskit.providers.models import BackendConfiguration
 from qiskit.providers import Options
@@ -23,7 +27,8 @@ from qiskit import QuantumCircuit, QiskitError, QuantumRegister, ClassicalRegist
 
 
 from circuit_to_cold_atom import circuit_to_cold_atom
-from cold_atom_job import ColdAtomJob
+from cold_atom_job import ColdAtomJob, ColdAtomSimulatorJob
+from coherent_spin_simulation import DriftPropagators, simulate_experiment
 
 import json
 
@@ -127,43 +132,60 @@ class CoherentSpinsDevice(BosonicBackend):
 
 class CoherentSpinsSimulator(BosonicBackend):
     """Backend to describe a cold atom hardware using qudits encoded in coherent spins of trapped BECs
-    as proposed in https://arxiv.org/pdf/2010.15923."""
+    as proposed in https://arxiv.org/pdf/2010.15923.
+
+    Each site holds a sodium and a lithium wire. Between the gates, every site drifts under the
+    permanent Hamiltonian H_perm for the duration of the delays in the circuit, which therefore
+    act on all wires."""
 
     _DEFAULT_CONFIGURATION = {
         "backend_name": "coherent_spin_qubits",
         "backend_version": "0.0.1",
-        "n_qubits": 5,
-        "simulator": False,
-        "local": False,
-        # all-to-all coupling:
-        "coupling_map": [
-            [0, 1],
-            [0, 2],
-            [1, 2],
-            [0, 3],
-            [1, 3],
-            [2, 3],
-            [0, 4],
-            [1, 4],
-            [2, 4],
-            [3, 4],
-            [1, 0],
-            [2, 0],
-            [2, 1],
-            [3, 0],
-            [3, 1],
-            [3, 2],
-            [4, 0],
-            [4, 1],
-            [4, 2],
-            [4, 3],
-        ],
-        "description": "Cold atom qubits encoded in coherent spins of trapped BECs",
-        "basis_gates": ["id", "rx", "rz", "rz2", "cz"],
-        "memory": False,
+        "n_qubits": 4,
+        "atomic_species": ["na", "li"],
+        # number of atoms per wire of each species
+        "num_atoms": {"na": 20, "li": 4},
+        # parameters of the permanent Hamiltonian in units of the inverse delay time; delta is
+        # the default detuning for delays that do not set their own
+        "drift_hamiltonian": {"chi": 0.01, "delta": 0.1, "lambda": 0.05},
+        "simulator": True,
+        "local": True,
+        # the sodium and lithium wires of each site are coupled by the drift:
+        "coupling_map": [[0, 2], [2, 0], [1, 3], [3, 1]],
+        "description": "Cold atom qudits encoded in coherent spins of trapped BECs",
+        "basis_gates": ["rLx", "rLz", "rLz2"],
+        "memory": True,
         "max_shots": 1000,
+        "max_experiments": 100,
         "open_pulse": False,
-        "gates": [],
+        "gates": [
+            {
+                # the permanent Hamiltonian acts on all wires simultaneously
+                "coupling_map": [[0, 1, 2, 3]],
+                "name": "delay",
+                "parameters": ["tau", "delta"],
+                "qasm_def": "gate delay(tau, delta) {}",
+            },
+            {
+                "coupling_map": [[0], [1], [2], [3]],
+                "name": "rLz",
+                "parameters": ["delta"],
+                "qasm_def": "gate rLz(delta) {}",
+            },
+            {
+                "coupling_map": [[0], [1], [2], [3]],
+                "name": "rLz2",
+                "parameters": ["chi"],
+                "qasm_def": "gate rLz2(chi) {}",
+            },
+            {
+                "coupling_map": [[0], [1], [2], [3]],
+                "name": "rLx",
+                "parameters": ["omega"],
+                "qasm_def": "gate rLx(omega) {}",
+            },
+        ],
+        "supported_instructions": ["delay", "rLx", "rLz", "rLz2", "measure", "barrier"],
         "conditional": False,
     }
 
@@ -180,6 +202,57 @@ class CoherentSpinsSimulator(BosonicBackend):
     def _default_options(cls):
         return Options(shots=1)
 
-    def run(self, circuits, **kwargs):
-        """Run a simulation job. TODO"""
-        pass
+    def run(
+        self,
+        circuits: Union[QuantumCircuit, List[QuantumCircuit]],
+        shots: int = 1,
+        seed: int = None,
+        **kwargs
+    ) -> ColdAtomSimulatorJob:
+        """Simulate a quantum circuit or list of quantum circuits.
+
+        Args:
+            circuits: The circuits to simulate.
+            shots: The number of shots for each circuit.
+            seed: The seed of the random number generator used to sample the measurements.
+
+        Returns:
+            A job holding the result of the simulation.
+        """
+        if isinstance(circuits, QuantumCircuit):
+            circuits = [circuits]
+
+        payload = circuit_to_cold_atom(circuits, self, shots=shots)
+        config = self.configuration().to_dict()
+
+        num_atoms = [config["num_atoms"][species] for species in config["atomic_species"]]
+        num_sites = config["n_qubits"] // len(num_atoms)
+        hamiltonian = config["drift_hamiltonian"]
+        drift = DriftPropagators(
+            num_atoms, hamiltonian["chi"], hamiltonian["delta"], hamiltonian["lambda"]
+        )
+        rng = np.random.default_rng(seed)
+
+        results = []
+        for circuit, experiment in zip(circuits, payload.values()):
+            memory = simulate_experiment(experiment, num_atoms, num_sites, drift, rng)
+            results.append(
+                {
+                    "header": {"name": circuit.name},
+                    "shots": shots,
+                    "success": True,
+                    "data": {"counts": dict(Counter(memory)), "memory": memory},
+                }
+            )
+
+        job_id = str(uuid.uuid4())
+        result_dict = {
+            "backend_name": self.name(),
+            "backend_version": config["backend_version"],
+            "job_id": job_id,
+            "qobj_id": None,
+            "success": True,
+            "results": results,
+        }
+
+        return ColdAtomSimulatorJob(self, job_id, result_dict)
@@ -14,9 +14,11 @@
 
 """module to convert cold atom circuits to dictionaries"""
 
+import math
 from typing import Union, List
 
 from qiskit import QuantumCircuit, QiskitError
+from qiskit.circuit import Delay
 from qiskit.providers import BackendV1 as Backend
 
 
@@ -64,6 +66,30 @@ def circuit_to_data(circuit: QuantumCircuit, backend):
                 "Cannot run circuit with unbound parameters."
             ) from type_error
 
+        # Qiskit's own delay acts on single qubits only and has no notion of the drift
+        if isinstance(inst[0], Delay):
+            raise QiskitError(
+                "Qiskit delays are not supported; use the delay of the gate library "
+                "(QuantumCircuit.ldelay) which acts on all wires"
+            )
+
+        # the system can only drift forward in time
+        if name == "delay" and not (
+            all(math.isfinite(param) for param in params) and params[0] >= 0
+        ):
+            raise QiskitError(
+                f"delay parameters must be finite with a non-negative duration; {params} was given"
+            )
+
+        # all wires are read out at once, so each wire must be stored in the clbit of same index
+        if name == "measure":
+            clbits = [circuit.clbits.index(clbit) for clbit in inst[2]]
+            if clbits != wires:
+                raise QiskitError(
+                    f"wires {wires} must be measured into the clbits of the same index; "
+                    f"clbits {clbits} were given"
+                )
+
         # check if instruction is supported by the backend
         if name not in native_instructions:
             raise QiskitError(f"{backend.name()} does not support {name}")
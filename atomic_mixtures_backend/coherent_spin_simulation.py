@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2021.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""module to simulate atomic mixture circuits on the collective spins of each wire"""
+
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+
+import numpy as np
+from qiskit import QiskitError
+
+
+@lru_cache(maxsize=None)
+def spin_operators(num_atoms: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Collective spin operators of num_atoms two-level atoms in the Schwinger representation.
+    The basis state k corresponds to k atoms in the upper state, i.e. to L_z = k - num_atoms / 2.
+
+    Args:
+        num_atoms: The number of atoms on the wire.
+
+    Returns:
+        The (read-only) operators L_z, L_+ and L_x.
+    """
+    spin = num_atoms / 2
+    m_z = np.arange(num_atoms + 1) - spin
+
+    l_z = np.diag(m_z)
+    l_plus = np.diag(np.sqrt(spin * (spin + 1) - m_z[:-1] * (m_z[:-1] + 1)), k=-1)
+    l_x = (l_plus + l_plus.T) / 2
+
+    for operator in (l_z, l_plus, l_x):
+        operator.setflags(write=False)
+
+    return l_z, l_plus, l_x
+
+
+@lru_cache(maxsize=None)
+def _lx_eigensystem(num_atoms: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Diagonalize L_x once per spin length as it is needed by every rLx gate."""
+    return np.linalg.eigh(spin_operators(num_atoms)[2])
+
+
+def _evolve(energies: np.ndarray, vectors: np.ndarray, time: float) -> np.ndarray:
+    """Propagator exp(-i H t) of a Hamiltonian H given by its eigensystem."""
+    return (vectors * np.exp(-1j * time * energies)) @ vectors.conj().T
+
+
+def gate_unitary(name: str, params: Sequence[float], num_atoms: int) -> np.ndarray:
+    """
+    Unitary of a single-wire gate from the gate library.
+
+    Args:
+        name: The name of the gate.
+        params: The parameters of the gate.
+        num_atoms: The number of atoms on the wire the gate acts on.
+
+    Returns:
+        The unitary of the gate as a matrix.
+
+    Raises:
+        QiskitError: If the gate can not be simulated
+    """
+    m_z = np.diag(spin_operators(num_atoms)[0])
+
+    if name == "rLx":
+        return _evolve(*_lx_eigensystem(num_atoms), params[0])
+    if name == "rLz":
+        return np.diag(np.exp(-1j * params[0] * m_z))
+    if name == "rLz2":
+        return np.diag(np.exp(-1j * params[0] * m_z ** 2))
+
+    raise QiskitError(f"the simulator can not apply the instruction {name}")
+
+
+def drift_hamiltonian(
+    num_atoms: Sequence[int], chi: float, delta: float, lamb: float
+) -> np.ndarray:
+    """
+    The permanent Hamiltonian H_n of a single site, following eq. (1) of the design document
+
+        H_n = chi * L_z,S^2 + delta / 2 * (n_L,0 - n_L,1) + lamb * (b_L,0^+ L_-,S b_L,1 + h.c.)
+            = chi * L_z,S^2 - delta * L_z,L + lamb * (L_-,S L_-,L + L_+,S L_+,L)
+
+    where S is the first (sodium) and L the second (lithium) atomic species of the site. For both
+    species, state 1 is the upper state as in the Schwinger representation of the design, i.e.
+    L_z = (n_1 - n_0) / 2 and L_+ = b_1^+ b_0. The spin-changing term flips one atom of each
+    species in the same direction and conserves L_z,S - L_z,L.
+
+    Args:
+        num_atoms: The number of atoms of each species on the site (one or two species).
+        chi: The strength of the one-axis-twisting term.
+        delta: The energy difference between the states of the second species.
+        lamb: The strength of the spin-changing interaction.
+
+    Returns:
+        The Hamiltonian acting on the product space of the wires of the site.
+
+    Raises:
+        QiskitError: If the site does not consist of one or two atomic species
+    """
+    if len(num_atoms) == 1:
+        l_z = spin_operators(num_atoms[0])[0]
+        return chi * l_z @ l_z
+
+    if len(num_atoms) != 2:
+        raise QiskitError(
+            f"drift is only defined for one or two atomic species; {len(num_atoms)} were given"
+        )
+
+    s_z, s_plus, _ = spin_operators(num_atoms[0])
+    l_z, l_plus, _ = spin_operators(num_atoms[1])
+    s_id = np.eye(num_atoms[0] + 1)
+    l_id = np.eye(num_atoms[1] + 1)
+
+    spin_changing = np.kron(s_plus, l_plus)
+
+    return (
+        chi * np.kron(s_z @ s_z, l_id)
+        - delta * np.kron(s_id, l_z)
+        + lamb * (spin_changing + spin_changing.T)
+    )
+
+
+@lru_cache(maxsize=16)
+def drift_eigensystem(
+    num_atoms: Tuple[int, ...], chi: float, delta: float, lamb: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Diagonalize the permanent Hamiltonian of a site once per Hamiltonian configuration."""
+    return np.linalg.eigh(drift_hamiltonian(num_atoms, chi, delta, lamb))
+
+
+class DriftPropagators:
+    """
+    Exact propagators exp(-i H_n tau) of the permanent Hamiltonian of a single site.
+
+    The Hamiltonian of each detuning delta is diagonalized only once by drift_eigensystem. The
+    propagators of the most recent delay times are kept in a bounded cache, so that repeated
+    delays only cost a lookup. Delay times are rounded to 12 significant digits, such that sums
+    of delays like 0.1 + 0.2 hit the same propagator as 0.3.
+    """
+
+    def __init__(
+        self, num_atoms: Sequence[int], chi: float, delta: float, lamb: float, maxsize: int = 64
+    ):
+        """
+        Args:
+            num_atoms: The number of atoms of each species on a site.
+            chi: The strength of the one-axis-twisting term.
+            delta: The default detuning of the second species.
+            lamb: The strength of the spin-changing interaction.
+            maxsize: The maximal number of cached propagators.
+        """
+        self._num_atoms = tuple(num_atoms)
+        self._chi = chi
+        self._lamb = lamb
+        self.delta = delta
+        self._propagator = lru_cache(maxsize=maxsize)(self._compute_propagator)
+
+    def _compute_propagator(self, tau: float, delta: float) -> np.ndarray:
+        """Evolve with the eigensystem of the Hamiltonian with the given detuning."""
+        eigensystem = drift_eigensystem(self._num_atoms, self._chi, delta, self._lamb)
+        return _evolve(*eigensystem, tau)
+
+    def __call__(self, tau: float, delta: float = None) -> np.ndarray:
+        """
+        Args:
+            tau: The delay time.
+            delta: The detuning during the delay; defaults to the detuning of the backend.
+
+        Returns:
+            The propagator of the site for the delay time tau.
+        """
+        if delta is None:
+            delta = self.delta
+
+        return self._propagator(float(f"{tau:.12g}"), delta)
+
+    def cache_info(self):
+        """Returns: the statistics of the propagator cache, see functools.lru_cache."""
+        return self._propagator.cache_info()
+
+
+def _apply(state: np.ndarray, unitary: np.ndarray, wires: List[int]) -> np.ndarray:
+    """Apply a unitary on the product space of the given wires to the state tensor."""
+    num_wires = len(wires)
+    dims = [state.shape[wire] for wire in wires]
+
+    unitary = unitary.reshape(dims + dims)
+    state = np.tensordot(unitary, state, axes=(list(range(num_wires, 2 * num_wires)), wires))
+
+    return np.moveaxis(state, list(range(num_wires)), wires)
+
+
+def evolve_experiment(
+    experiment: dict,
+    num_atoms: Sequence[int],
+    num_sites: int,
+    drift: DriftPropagators,
+) -> Tuple[np.ndarray, List[int]]:
+    """
+    Evolve the state of all wires under the instructions of an experiment created by
+    circuit_to_cold_atom.
+
+    The wires are laid out as in BosonicBackend.get_empty_circuit, i.e. wire w holds the
+    species w // num_sites on the site w % num_sites. Initially all atoms are in the lower state.
+    Gates are instantaneous while each delay, which must act on all wires, lets all sites drift
+    under their permanent Hamiltonian for its duration tau and with its detuning delta, if given.
+    The drift of a site is deferred until the next gate acts on it, so a single delay between two
+    gates is applied with the cached propagator of its tau and consecutive delays with the same
+    detuning are applied as one propagator. Measurements read out the wires at the end of the
+    experiment.
+
+    Args:
+        experiment: The experiment with its instructions.
+        num_atoms: The number of atoms of each atomic species.
+        num_sites: The number of sites.
+        drift: The propagators of the permanent Hamiltonian of a site.
+
+    Returns:
+        The final state as a tensor with one axis per wire and the sorted measured wires.
+
+    Raises:
+        QiskitError: If an instruction acts on a wire that does not exist on the backend or that
+            has already been measured, or if a delay does not act on all wires
+    """
+    num_wires = len(num_atoms) * num_sites
+    dims = [num_atoms[wire // num_sites] + 1 for wire in range(num_wires)]
+
+    state = np.zeros(dims, dtype=complex)
+    state[(0,) * num_wires] = 1.0
+
+    # time for which each site still has to drift and the detuning during that time
+    pending = np.zeros(num_sites)
+    pending_delta = [drift.delta] * num_sites
+    measured = set()
+
+    def drift_site(state, site):
+        if pending[site] > 0:
+            wires = [site + species * num_sites for species in range(len(num_atoms))]
+            state = _apply(state, drift(pending[site], pending_delta[site]), wires)
+            pending[site] = 0.0
+        return state
+
+    for name, wires, params in experiment["instructions"]:
+        if any(wire >= num_wires for wire in wires):
+            raise QiskitError(f"instruction {name} acts on wires {wires} of {num_wires} wires")
+
+        if name == "measure":
+            measured.update(wires)
+        elif name == "barrier":
+            continue
+        elif measured.intersection(wires):
+            raise QiskitError(
+                f"instruction {name} acts on wires {wires} after they have been measured"
+            )
+        elif name == "delay":
+            if sorted(wires) != list(range(num_wires)):
+                raise QiskitError(
+                    f"the permanent Hamiltonian acts on all {num_wires} wires; "
+                    f"delay on wires {wires} is not supported"
+                )
+            delta = params[1] if len(params) > 1 else drift.delta
+            for site in range(num_sites):
+                if pending_delta[site] != delta:
+                    state = drift_site(state, site)
+                    pending_delta[site] = delta
+            pending += params[0]
+        else:
+            if len(wires) != 1:
+                raise QiskitError(f"the simulator can only apply single-wire gates; {name} "
+                                  f"acts on wires {wires}")
+            wire = wires[0]
+            state = drift_site(state, wire % num_sites)
+            state = _apply(state, gate_unitary(name, params, dims[wire] - 1), [wire])
+
+    for site in range(num_sites):
+        state = drift_site(state, site)
+
+    return state, sorted(measured)
+
+
+def simulate_experiment(
+    experiment: dict,
+    num_atoms: Sequence[int],
+    num_sites: int,
+    drift: DriftPropagators,
+    rng: np.random.Generator,
+) -> List[str]:
+    """
+    Simulate a single experiment of a payload created by circuit_to_cold_atom and sample the
+    occupations of the measured wires.
+
+    Args:
+        experiment: The experiment with its instructions and number of shots.
+        num_atoms: The number of atoms of each atomic species.
+        num_sites: The number of sites.
+        drift: The propagators of the permanent Hamiltonian of a site.
+        rng: The random number generator used to sample the measurements.
+
+    Returns:
+        For each shot, the occupations of the measured wires with the highest wire first as in
+        the bit order of Qiskit; empty if no wire is measured.
+    """
+    state, measured = evolve_experiment(experiment, num_atoms, num_sites, drift)
+
+    if not measured:
+        return []
+
+    unmeasured = tuple(wire for wire in range(state.ndim) if wire not in measured)
+    probabilities = (np.abs(state) ** 2).sum(axis=unmeasured)
+
+    outcomes = rng.choice(
+        probabilities.size,
+        size=experiment["shots"],
+        p=probabilities.ravel() / probabilities.sum(),
+    )
+    occupations = np.unravel_index(outcomes, probabilities.shape)
+
+    return [
+        " ".join(str(occupation[shot]) for occupation in reversed(occupations))
+        for shot in range(experiment["shots"])
+    ]
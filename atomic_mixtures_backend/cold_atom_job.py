@@ -18,10 +18,8 @@ from typing import Dict
 import time
 import requests
 
-from typing import Union
 from qiskit.providers import (
     BackendV1,
-    BaseBackend,
     JobTimeoutError,
     JobError,
     JobStatus,
@@ -33,7 +31,7 @@ import json
 
 
 class ColdAtomJob(Job):
-    def __init__(self, backend: Union[BackendV1, BaseBackend], job_id: str):
+    def __init__(self, backend: BackendV1, job_id: str):
         """
         Args:
             backend: The backend on which the job was run.
@@ -124,3 +122,27 @@ class ColdAtomJob(Job):
 
     def submit(self):
         pass
+
+
+class ColdAtomSimulatorJob(Job):
+    """Job for cold atom simulations which are carried out locally when the job is created."""
+
+    def __init__(self, backend: BackendV1, job_id: str, result_dict: Dict):
+        """
+        Args:
+            backend: The backend on which the job was run.
+            job_id: The ID of the job.
+            result_dict: The simulation result formatted according to Qiskit schemas.
+        """
+        super().__init__(backend, job_id)
+        self._result_dict = result_dict
+
+    def result(self) -> Result:
+        """Return the result of the simulation."""
+        return Result.from_dict(self._result_dict)
+
+    def status(self):
+        return JobStatus.DONE
+
+    def submit(self):
+        pass
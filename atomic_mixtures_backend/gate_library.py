@@ -105,3 +105,39 @@ class GeneralRotation(Gate):
     def __init__(self, chi, delta, omega, label=None):
         """Create new general rotation gate."""
         super().__init__('rot', 1, [chi, delta, omega], label=label)
+
+
+class DelayGate(Gate):
+    r"""Idle evolution of the wires under the permanent Hamiltonian H_perm for a time tau.
+
+    Between the fast gates the system always drifts under H_perm, i.e. the one-axis-twisting,
+    the Zeeman and the spin-changing terms. The delay is the only instruction that advances the
+    time of the experiment. The detuning delta of the lithium atoms is tunable via the magnetic
+    field and can be set for each delay; otherwise, it and the other Hamiltonian parameters are
+    set by the backend.
+
+    **Circuit symbol:**
+
+    .. parsed-literal::
+
+             ┌────────────┐
+        q_0: ┤0           ├
+             │  Delay(tau)│
+        q_1: ┤1           ├
+             └────────────┘
+    """
+
+    def __init__(self, tau, num_wires=1, delta=None, label=None):
+        """Create new delay gate."""
+        params = [tau] if delta is None else [tau, delta]
+        super().__init__('delay', num_wires, params, label=label)
+
+
+@add_gate
+def ldelay(self, tau, wires=None, delta=None):
+    """add a delay of duration tau on the given wires (all wires by default) to a QuantumCircuit"""
+    if wires is None:
+        wires = self.qubits
+    elif isinstance(wires, int):
+        wires = [wires]
+    return self.append(DelayGate(tau, num_wires=len(wires), delta=delta), list(wires), [])
@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2021.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Tests for the drift of the coherent spins simulator."""
+
+from copy import deepcopy
+from unittest import TestCase
+
+import numpy as np
+from scipy.linalg import expm
+from qiskit import QiskitError
+
+import gate_library  # pylint: disable=unused-import
+from bosonic_backends import CoherentSpinsSimulator
+from circuit_to_cold_atom import circuit_to_cold_atom
+from coherent_spin_simulation import (
+    DriftPropagators,
+    drift_eigensystem,
+    drift_hamiltonian,
+    evolve_experiment,
+    spin_operators,
+)
+
+
+def fidelity(state, other):
+    """Overlap of two states, insensitive to a global phase."""
+    return abs(np.vdot(state.ravel(), other.ravel()))
+
+
+class TestDrift(TestCase):
+    """Tests of delays evolving the circuit under the permanent Hamiltonian."""
+
+    def setUp(self):
+        self.set_backend(CoherentSpinsSimulator())
+
+    def set_backend(self, backend):
+        """Use the given backend and the parameters of its permanent Hamiltonian."""
+        self.backend = backend
+        config = self.backend.configuration().to_dict()
+        self.num_atoms = [config["num_atoms"][species] for species in config["atomic_species"]]
+        self.num_sites = config["n_qubits"] // len(self.num_atoms)
+        self.parameters = config["drift_hamiltonian"]
+        self.hamiltonian = drift_hamiltonian(
+            self.num_atoms,
+            self.parameters["chi"],
+            self.parameters["delta"],
+            self.parameters["lambda"],
+        )
+
+    def new_drift(self):
+        """Return new drift propagators of the backend."""
+        return DriftPropagators(
+            self.num_atoms,
+            self.parameters["chi"],
+            self.parameters["delta"],
+            self.parameters["lambda"],
+        )
+
+    def evolve(self, circuit, drift=None):
+        """Return the final state of a circuit on the backend."""
+        experiment = circuit_to_cold_atom(circuit, self.backend)["experiment_0"]
+        return self.evolve_experiment(experiment, drift)
+
+    def evolve_experiment(self, experiment, drift=None):
+        """Return the final state of an experiment of a payload."""
+        if drift is None:
+            drift = self.new_drift()
+        return evolve_experiment(experiment, self.num_atoms, self.num_sites, drift)[0]
+
+    def test_hamiltonian_follows_design(self):
+        """Test that the spin-changing term conserves L_z,S - L_z,L as in eq. (1)."""
+        s_z = np.kron(spin_operators(self.num_atoms[0])[0], np.eye(self.num_atoms[1] + 1))
+        l_z = np.kron(np.eye(self.num_atoms[0] + 1), spin_operators(self.num_atoms[1])[0])
+
+        self.assertTrue(np.allclose(self.hamiltonian, self.hamiltonian.conj().T))
+        conserved = s_z - l_z
+        self.assertTrue(np.allclose(self.hamiltonian @ conserved, conserved @ self.hamiltonian))
+
+    def test_delay_matches_exact_evolution(self):
+        """Test that a delay evolves each site with exp(-i H tau)."""
+        tau = 3.7
+
+        circuit = self.backend.get_empty_circuit()
+        circuit.lx(0.9, 0)
+        circuit.lx(0.4, 2)
+        initial = self.evolve(circuit)
+
+        circuit.ldelay(tau)
+
+        # evolve the wires of each site with the full propagator
+        expected = initial
+        propagator = expm(-1j * tau * self.hamiltonian)
+        for site_wires in ([0, 2], [1, 3]):
+            expected = np.moveaxis(expected, site_wires, [0, 1])
+            shape = expected.shape
+            expected = (propagator @ expected.reshape(propagator.shape[0], -1)).reshape(shape)
+            expected = np.moveaxis(expected, [0, 1], site_wires)
+
+        self.assertTrue(np.allclose(self.evolve(circuit), expected))
+
+    def test_consecutive_delays_match_summed_delay(self):
+        """Test that consecutive delays are equivalent to a single delay of the summed duration."""
+        split = self.backend.get_empty_circuit()
+        split.lx(0.9, 0)
+        for tau in (0.5, 1.2, 2.3):
+            split.ldelay(tau)
+        split.lx(0.3, 2)
+
+        summed = self.backend.get_empty_circuit()
+        summed.lx(0.9, 0)
+        summed.ldelay(4.0)
+        summed.lx(0.3, 2)
+
+        self.assertTrue(np.allclose(self.evolve(split), self.evolve(summed)))
+
+    def test_delay_drifts_all_sites(self):
+        """Test that a delay drifts the sites which are not acted on by any gate after it."""
+        drifted = self.backend.get_empty_circuit()
+        drifted.lx(0.9, 1)
+        drifted.ldelay(50.0)
+        drifted.measure([1, 3], [1, 3])
+
+        idle = self.backend.get_empty_circuit()
+        idle.lx(0.9, 1)
+        idle.measure([1, 3], [1, 3])
+
+        self.assertFalse(np.allclose(self.evolve(drifted), self.evolve(idle)))
+
+    def test_delay_on_subset_of_wires_is_rejected(self):
+        """Test that delays must act on all wires."""
+        circuit = self.backend.get_empty_circuit()
+        circuit.ldelay(50.0, wires=[0, 2])
+
+        with self.assertRaises(QiskitError):
+            circuit_to_cold_atom(circuit, self.backend)
+
+    def test_invalid_delays_are_rejected(self):
+        """Test that negative and NaN delays as well as Qiskit delays are rejected."""
+        for tau in (-1.0, float("nan")):
+            circuit = self.backend.get_empty_circuit()
+            circuit.ldelay(tau)
+
+            with self.assertRaises(QiskitError):
+                circuit_to_cold_atom(circuit, self.backend)
+
+        for unit in ("dt", "s"):
+            circuit = self.backend.get_empty_circuit()
+            circuit.delay(5, unit=unit)
+
+            with self.assertRaisesRegex(QiskitError, "Qiskit delays are not supported"):
+                circuit_to_cold_atom(circuit, self.backend)
+
+    def test_propagator_is_cached_per_tau(self):
+        """Test that repeated delays of the same duration use a single cached propagator."""
+        drift = self.new_drift()
+
+        circuit = self.backend.get_empty_circuit()
+        for _ in range(100):
+            circuit.lx(0.1, 0)
+            circuit.lx(0.1, 1)
+            circuit.ldelay(0.7)
+        self.evolve(circuit, drift)
+
+        self.assertEqual(drift.cache_info().currsize, 1)
+
+    def test_propagator_cache_is_bounded(self):
+        """Test that sweeps over many delay times keep a bounded number of propagators."""
+        drift = DriftPropagators(self.num_atoms, 0.01, 0.1, 0.05, maxsize=8)
+        for tau in np.linspace(0.1, 10, 100):
+            drift(tau)
+
+        self.assertEqual(drift.cache_info().currsize, 8)
+
+    def test_summed_delay_times_share_propagator(self):
+        """Test that float sums of delay times hit the propagator of the rounded sum."""
+        drift = self.new_drift()
+        drift(0.1 + 0.2)
+        drift(0.3)
+
+        self.assertEqual(drift.cache_info().hits, 1)
+
+    def test_gate_after_measurement_is_rejected(self):
+        """Test that wires can not be acted on after they have been measured."""
+        circuit = self.backend.get_empty_circuit()
+        circuit.measure(0, 0)
+        circuit.lx(0.1, 0)
+
+        with self.assertRaises(QiskitError):
+            self.evolve(circuit)
+
+    def test_run_caches_diagonalization(self):
+        """Test that the permanent Hamiltonian is diagonalized once for several runs."""
+        drift_eigensystem.cache_clear()
+
+        circuit = self.backend.get_empty_circuit()
+        circuit.lx(0.9, 0)
+        circuit.ldelay(2.0)
+        circuit.measure([0, 2], [0, 2])
+
+        for seed in range(3):
+            result = self.backend.run(circuit, shots=10, seed=seed).result()
+            self.assertEqual(sum(result.get_counts().values()), 10)
+
+        self.assertEqual(drift_eigensystem.cache_info().misses, 1)
+
+    def test_delay_with_detuning(self):
+        """Test that a delay with its own detuning diagonalizes the Hamiltonian of that detuning."""
+        drift_eigensystem.cache_clear()
+
+        circuit = self.backend.get_empty_circuit()
+        circuit.lx(0.9, 0)
+        circuit.ldelay(2.0, delta=0.7)
+        circuit.lx(0.9, 0)
+        circuit.ldelay(2.0)
+
+        expected = self.backend.get_empty_circuit()
+        expected.lx(0.9, 0)
+        expected.ldelay(2.0, delta=0.7)
+        expected.lx(0.9, 0)
+        expected.ldelay(2.0, delta=self.parameters["delta"])
+
+        self.assertTrue(np.allclose(self.evolve(circuit), self.evolve(expected)))
+        self.assertEqual(drift_eigensystem.cache_info().currsize, 2)
+
+    def test_sign_of_detuning(self):
+        """Test that the detuning rotates the lithium spin as -delta * L_z,L."""
+        config = deepcopy(CoherentSpinsSimulator._DEFAULT_CONFIGURATION)
+        config["drift_hamiltonian"] = {"chi": 0.0, "delta": 0.3, "lambda": 0.0}
+        self.set_backend(CoherentSpinsSimulator(config_dict=config))
+        tau = 2.0
+
+        drifted = self.backend.get_empty_circuit()
+        drifted.lx(np.pi / 2, 2)
+        drifted.ldelay(tau)
+
+        rotated = self.backend.get_empty_circuit()
+        rotated.lx(np.pi / 2, 2)
+        rotated.lz(-0.3 * tau, 2)
+
+        opposite = self.backend.get_empty_circuit()
+        opposite.lx(np.pi / 2, 2)
+        opposite.lz(0.3 * tau, 2)
+
+        self.assertAlmostEqual(fidelity(self.evolve(drifted), self.evolve(rotated)), 1.0)
+        self.assertLess(fidelity(self.evolve(drifted), self.evolve(opposite)), 0.99)
+
+    def test_partial_delay_in_payload_is_rejected(self):
+        """Test that the simulator rejects delays on some wires even if the backend allows them."""
+        experiment = {"instructions": [("delay", [0, 2], [50.0])], "shots": 1}
+
+        with self.assertRaises(QiskitError):
+            self.evolve_experiment(experiment)
+
+
+class TestMeasurement(TestCase):
+    """Tests of the sampled measurements of the coherent spins simulator."""
+
+    def setUp(self):
+        self.backend = CoherentSpinsSimulator()
+
+    def test_circuit_without_measurement(self):
+        """Test that a circuit without measurements has no memory."""
+        circuit = self.backend.get_empty_circuit()
+        circuit.lx(1.0, 0)
+
+        result = self.backend.run(circuit, shots=5).result()
+
+        self.assertEqual(result.get_memory(), [])
+        self.assertEqual(dict(result.get_counts()), {})
+
+    def test_clbits_must_match_wires(self):
+        """Test that wires can only be measured into the clbits of the same index."""
+        circuit = self.backend.get_empty_circuit()
+        circuit.measure([0, 2], [3, 1])
+
+        with self.assertRaises(QiskitError):
+            self.backend.run(circuit)
+
+    def test_memory_order(self):
+        """Test that the memory lists the highest measured wire first."""
+        circuit = self.backend.get_empty_circuit()
+        circuit.lx(np.pi, 0)
+        circuit.measure([0, 2], [0, 2])
+
+        memory = self.backend.run(circuit, shots=3).result().get_memory()
+
+        self.assertEqual(memory, ["0 20"] * 3)
+
+    def test_counts_follow_probabilities(self):
+        """Test that the sampled occupations follow the probabilities of the final state."""
+        circuit = self.backend.get_empty_circuit()
+        circuit.lx(0.8, 2)
+        circuit.ldelay(5.0)
+        circuit.measure(2, 2)
+
+        config = self.backend.configuration().to_dict()
+        num_atoms = [config["num_atoms"][species] for species in config["atomic_species"]]
+        hamiltonian = config["drift_hamiltonian"]
+        drift = DriftPropagators(
+            num_atoms, hamiltonian["chi"], hamiltonian["delta"], hamiltonian["lambda"]
+        )
+        experiment = circuit_to_cold_atom(circuit, self.backend)["experiment_0"]
+        state = evolve_experiment(experiment, num_atoms, 2, drift)[0]
+        probabilities = (np.abs(state) ** 2).sum(axis=(0, 1, 3))
+
+        shots = 1000
+        counts = self.backend.run(circuit, shots=shots, seed=0).result().get_counts()
+        frequencies = [counts.get(str(occupation), 0) / shots for occupation in range(5)]
+
+        self.assertTrue(np.allclose(frequencies, probabilities, atol=0.05))